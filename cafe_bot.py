@@ -1,7 +1,14 @@
+import asyncio
 import logging
+import signal
 import random
 import os
+import time
 import csv
+import json
+import math
+from collections import Counter, deque
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,10 +23,13 @@ from telegram.ext import (
     filters,
 )
 
+from telegram.request import HTTPXRequest
+
 from telegram.error import TimedOut, NetworkError
 
 async def send_paynow_qr_safe(context, chat_id: int, total: float, order_id: str):
-    if not PAYNOW_QR.exists():
+    paynow_qr = get_tenant(context).paynow_qr
+    if not paynow_qr.exists():
         await context.bot.send_message(
             chat_id=chat_id,
             text=f"⚠️ QR code image not found.\nAmount to pay: ${total:.2f}\nOrder #{order_id}"
@@ -27,7 +37,7 @@ async def send_paynow_qr_safe(context, chat_id: int, total: float, order_id: str
         return
 
     try:
-        with PAYNOW_QR.open("rb") as photo:
+        with paynow_qr.open("rb") as photo:
             await context.bot.send_photo(
                 chat_id=chat_id,
                 photo=photo,
@@ -86,9 +96,9 @@ logger = logging.getLogger(__name__)
 # ---------------------------
 BASE_DIR = Path(__file__).resolve().parent
 ORDERS_DIR = BASE_DIR / "orders"
-ORDERS_CSV = ORDERS_DIR / "orders.csv"
 ASSETS_DIR = BASE_DIR / "assets"
 PAYNOW_QR = ASSETS_DIR / "paynow_qr.jpg"
+TENANTS_JSON = BASE_DIR / "tenants.json"
 
 
 # ---------------------------
@@ -127,16 +137,110 @@ ADDONS_MENU = {
     "Extra Espresso Shot": 1.00,
 }
 
+WELCOME_TEXT = (
+    "☕ *Welcome to Kristy Krib's Home Cafe!*\n\n"
+    "📋 *Our Menu:*\n\n"
+    "*Matcha Drinks:*\n"
+    "• Iced Matcha - $7.00\n"
+    "• Strawberry Matcha - $8.00\n"
+    "*Coffee:*\n"
+    "• Iced Black - $4.50\n"
+    "• Ice White - $5.50\n"
+    "*Fresh Bakes:*\n"
+    "• Banana Bread - $4.00\n"
+    "• Earl Grey Madeleines - $5.00\n"
+    "• Matcha Madeleines - $6.00\n\n"
+    "🥛 *Add-ons:*\n"
+    "• Oat Milk (+$1.00)\n"
+    "• Add Espresso Shot (+$1.00)\n\n"
+    "Let's start your order! 👇"
+)
+
+
+def build_welcome_text(title, menu, addons_menu) -> str:
+    """Welcome text for tenants with their own menu."""
+    text = f"☕ *Welcome to {md_escape(title)}!*\n\n📋 *Our Menu:*\n\n"
+    for ctype, m in menu.items():
+        text += f"*{md_escape(ctype)}:*\n"
+        for name, price in m["varieties"].items():
+            text += f"• {md_escape(name)} - ${float(price):.2f}\n"
+    if addons_menu:
+        text += "\n🥛 *Add-ons:*\n"
+        for name, price in addons_menu.items():
+            text += f"• {md_escape(name)} (+${float(price):.2f})\n"
+    return text + "\nLet's start your order! 👇"
+
+
+def category_has_addons(menu, ctype) -> bool:
+    # Bakes never had add-ons; other menus can opt out with "addons": false
+    return menu[ctype].get("addons", ctype != "Bakes")
+
+
+# ---------------------------
+# Tenants (one cafe bot each, all in one process)
+# ---------------------------
+class Tenant:
+    """One cafe bot: its config plus its own order store and in-memory caches."""
+
+    def __init__(self, name, token, menu=None, addons_menu=None, orders_dir=None, paynow_qr=None,
+                 admin_chat_ids=None, title=None):
+        self.name = name
+        self.token = token
+        self.menu = menu or MENU
+        self.addons_menu = ADDONS_MENU if addons_menu is None else addons_menu
+        self.orders_dir = Path(orders_dir or ORDERS_DIR)
+        self.orders_csv = self.orders_dir / "orders.csv"
+        self.stock_json = self.orders_dir / "stock.json"
+        self.proofs_dir = self.orders_dir / "proofs"
+        self.paynow_qr = Path(paynow_qr or PAYNOW_QR)
+        self.admin_chat_ids = [int(c) for c in admin_chat_ids or []]
+
+        if self.menu is MENU and self.addons_menu is ADDONS_MENU:
+            self.welcome_text = WELCOME_TEXT
+        else:
+            self.welcome_text = build_welcome_text(title or name, self.menu, self.addons_menu)
+
+        self.variety_type = {v: ctype for ctype, m in self.menu.items() for v in m["varieties"]}
+
+        # variety -> units left. Varieties missing here are untracked (never sell out).
+        self.stock = {}
+        self.variety_keyboards = {}  # ctype -> InlineKeyboardMarkup (sold-out items hidden)
+        self.prep_avg = {}  # variety -> rolling average prep seconds
+        self.pending_queue = {}  # order_id -> (ordered_at, [varieties]); insertion order = queue order
+        self.last_ready_at = None  # when the kitchen last finished an order
+        self.recent_orders = deque()  # monotonic timestamps of recent admin notifications
+        self.admin_queue = asyncio.Queue()  # (bot, text) for admin_notifier; None = stop
+        self.refresh_in_flight = False
+        self.proof_downloads = set()  # file_unique_ids currently being downloaded
+        self.missing_proofs = {}  # file_unique_id -> (file_id, failed attempts) still to download
+
+
+def get_tenant(context) -> Tenant:
+    return context.bot_data["tenant"]
+
+
+def is_admin(update, tenant) -> bool:
+    """Only chats listed in the tenant's admin_chat_ids count as admins."""
+    return update.effective_chat is not None and update.effective_chat.id in tenant.admin_chat_ids
+
+
+def resolve_path(value):
+    """Relative paths in tenants.json are relative to this script."""
+    if not value:
+        return None
+    path = Path(value)
+    return path if path.is_absolute() else BASE_DIR / path
+
 
 # ---------------------------
 # CSV Helpers
 # ---------------------------
-def load_orders_rows():
+def load_orders_rows(tenant):
     """Return (header, rows). rows excludes header. If missing/empty -> (None, [])."""
-    if not ORDERS_CSV.exists():
+    if not tenant.orders_csv.exists():
         return None, []
 
-    with ORDERS_CSV.open("r", encoding="utf-8", newline="") as f:
+    with tenant.orders_csv.open("r", encoding="utf-8", newline="") as f:
         all_rows = list(csv.reader(f))
 
     if len(all_rows) < 2:
@@ -145,15 +249,31 @@ def load_orders_rows():
     return all_rows[0], all_rows[1:]
 
 
-def save_orders_rows(header, rows):
-    ORDERS_DIR.mkdir(parents=True, exist_ok=True)
-    with ORDERS_CSV.open("w", encoding="utf-8", newline="") as f:
+def save_orders_rows(tenant, header, rows):
+    tenant.orders_dir.mkdir(parents=True, exist_ok=True)
+    with tenant.orders_csv.open("w", encoding="utf-8", newline="") as f:
         w = csv.writer(f)
         if header:
             w.writerow(header)
         w.writerows(rows)
 
 
+ORDERS_HEADER = [
+    "Order ID", "Date", "Time", "Customer Name", "Username", "User ID", "Items", "Total", "Status",
+    "Ready At", "Proof File ID", "Proof Unique ID",
+]
+TIMESTAMP_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def ensure_header(header):
+    """Older CSVs were written with fewer columns; extend the header in place."""
+    if header is None:
+        return list(ORDERS_HEADER)
+    while len(header) < len(ORDERS_HEADER):
+        header.append(ORDERS_HEADER[len(header)])
+    return header
+
+
 def get_status(row):
     return row[8] if len(row) > 8 and row[8] else "pending"
 
@@ -164,49 +284,599 @@ def set_status(row, status):
     row[8] = status
 
 
+def row_ordered_at(row):
+    try:
+        return datetime.strptime(f"{row[1]} {row[2]}", TIMESTAMP_FMT)
+    except (IndexError, ValueError):
+        return None
+
+
+def row_ready_at(row):
+    try:
+        return datetime.strptime(row[9], TIMESTAMP_FMT)
+    except (IndexError, ValueError):
+        return None
+
+
+def mark_row_ready(header, row, ready_at):
+    """Set status + ready timestamp on a CSV row."""
+    set_status(row, "ready")
+    while len(row) < 10:
+        row.append("")
+    row[9] = ready_at.strftime(TIMESTAMP_FMT)
+    return ensure_header(header)
+
+
+def mark_ready_in_csv(tenant, order_id):
+    """
+    Flip a pending order to ready in one read-modify-write (run it via run_io).
+    Returns (row, ready_at, rows) or None if there's no such pending order.
+    """
+    header, rows = load_orders_rows(tenant)
+    for row in rows:
+        if row and row[0] == order_id and get_status(row) == "pending":
+            ready_at = datetime.now()
+            header = mark_row_ready(header, row, ready_at)
+            save_orders_rows(tenant, header, rows)
+            return row, ready_at, rows
+    return None
+
+
+def append_order_row(tenant, row):
+    tenant.orders_dir.mkdir(parents=True, exist_ok=True)
+    is_new_file = not tenant.orders_csv.exists() or tenant.orders_csv.stat().st_size == 0
+
+    with tenant.orders_csv.open("a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if is_new_file:
+            writer.writerow(ORDERS_HEADER)
+        writer.writerow(row)
+
+
+# ---------------------------
+# Background file writer (shared by all tenants)
+# ---------------------------
+# Every CSV/JSON read and write after startup goes through one queue and runs in a
+# worker thread, one job at a time. Blocking file I/O never stalls the shared event
+# loop, and because jobs run in submission order a read always sees earlier writes.
+_io_queue = asyncio.Queue()  # (func, args, future or None); None = stop
+
+
+async def file_writer():
+    while True:
+        job = await _io_queue.get()
+        if job is None:
+            return
+
+        func, args, fut = job
+        try:
+            result = await asyncio.to_thread(func, *args)
+        except Exception as e:
+            if fut is None:
+                logger.exception("Background %s failed", func.__name__)
+            elif not fut.done():
+                fut.set_exception(e)
+        else:
+            if fut is not None and not fut.done():
+                fut.set_result(result)
+
+
+def submit_io(func, *args):
+    """Queue a write without waiting for it (errors are logged)."""
+    _io_queue.put_nowait((func, args, None))
+
+
+async def run_io(func, *args):
+    """Queue a read or read-modify-write and wait for its result."""
+    fut = asyncio.get_running_loop().create_future()
+    _io_queue.put_nowait((func, args, fut))
+    return await fut
+
+
+async def stop_file_writer(writer):
+    """Finish every queued job (FIFO), then stop."""
+    _io_queue.put_nowait(None)
+    await writer
+
+
 # ---------------------------
 # Pricing
 # ---------------------------
-def calc_addon_price(addons: list[str]) -> float:
+def calc_addon_price(tenant, addons: list[str]) -> float:
     total = 0.0
     for a in addons:
-        if a in ADDONS_MENU:
-            total += float(ADDONS_MENU[a])
+        if a in tenant.addons_menu:
+            total += float(tenant.addons_menu[a])
         else:
             logger.warning("Unknown addon '%s' not found in ADDONS_MENU", a)
     return total
 
 
+# ---------------------------
+# Throttling (per-user token buckets)
+# ---------------------------
+# command -> (bucket capacity, tokens refilled per second).
+# "user" is the overall budget shared by every throttled button a user taps.
+RATE_LIMITS = {
+    "user": (10, 2.0),
+    "coffee": (4, 1.0),
+    "addon": (6, 2.0),
+    "refresh": (2, 0.2),
+}
+MAX_BUCKETS = 5000  # prune full buckets once this many are tracked
+
+# Buckets are process-wide: every tenant shares the same event loop.
+_buckets = {}  # (user_id, command) -> [tokens, last_refill]
+
+
+def get_bucket(user_id, command, now):
+    """Return the refilled [tokens, last_refill] bucket for (user, command)."""
+    capacity, rate = RATE_LIMITS[command]
+    key = (user_id, command)
+
+    bucket = _buckets.get(key)
+    if bucket is None:
+        bucket = _buckets[key] = [float(capacity), now]
+    else:
+        bucket[0] = min(float(capacity), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+    return bucket
+
+
+def prune_buckets(now):
+    """Drop buckets that have refilled completely (same as a fresh bucket)."""
+    for key, (tokens, last) in list(_buckets.items()):
+        capacity, rate = RATE_LIMITS[key[1]]
+        if tokens + (now - last) * rate >= capacity:
+            del _buckets[key]
+
+
+def allow_tap(query, command) -> bool:
+    """
+    Take one token from both the per-command bucket and the user's overall bucket.
+    Nothing is taken unless both have a token, so throttled taps don't drain either.
+    """
+    user_id = query.from_user.id
+    now = time.monotonic()
+    if len(_buckets) >= MAX_BUCKETS:
+        prune_buckets(now)
+
+    buckets = [get_bucket(user_id, command, now), get_bucket(user_id, "user", now)]
+    if any(b[0] < 1 for b in buckets):
+        return False
+    for b in buckets:
+        b[0] -= 1
+    return True
+
+
+# ---------------------------
+# Inventory (in-memory stock + cached variety keyboards, per tenant)
+# ---------------------------
+def load_stock(tenant):
+    tenant.stock.clear()
+    tenant.variety_keyboards.clear()
+    if not tenant.stock_json.exists():
+        return
+
+    try:
+        with tenant.stock_json.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read %s: %s", tenant.stock_json, e)
+        return
+
+    if not isinstance(data, dict):
+        logger.warning("Ignoring %s: expected an object of item -> count", tenant.stock_json)
+        return
+
+    for variety, qty in data.items():
+        if variety not in tenant.variety_type:
+            logger.warning("[%s] Ignoring stock for unknown item '%s'", tenant.name, variety)
+            continue
+        try:
+            tenant.stock[variety] = max(0, int(qty))
+        except (TypeError, ValueError):
+            logger.warning("[%s] Ignoring invalid stock %r for '%s'", tenant.name, qty, variety)
+
+
+def write_stock_file(tenant, stock):
+    tenant.orders_dir.mkdir(parents=True, exist_ok=True)
+    with tenant.stock_json.open("w", encoding="utf-8") as f:
+        json.dump(stock, f, indent=2)
+
+
+def save_stock(tenant):
+    # Snapshot now; the background writer may run after further changes
+    submit_io(write_stock_file, tenant, dict(tenant.stock))
+
+
+def in_stock(tenant, variety, qty=1) -> bool:
+    left = tenant.stock.get(variety)
+    return left is None or left >= qty
+
+
+def stock_shortfall(tenant, cart) -> list[str]:
+    """Varieties in the cart that don't have enough stock left."""
+    needed = Counter(item["variety"] for item in cart)
+    return [v for v, n in needed.items() if not in_stock(tenant, v, n)]
+
+
+def set_stock(tenant, variety, qty):
+    was_available = in_stock(tenant, variety)
+    tenant.stock[variety] = max(0, qty)
+    save_stock(tenant)
+
+    # Only the category whose keyboard actually changes is rebuilt
+    if in_stock(tenant, variety) != was_available:
+        tenant.variety_keyboards.pop(tenant.variety_type[variety], None)
+
+
+def take_stock(tenant, cart) -> list[str]:
+    """
+    Decrement stock for every item in the cart, all or nothing.
+    Returns the sold-out varieties (nothing is taken if the list is non-empty).
+    No awaits in here, so no other update can interleave.
+    """
+    short = stock_shortfall(tenant, cart)
+    if short:
+        return short
+
+    needed = Counter(item["variety"] for item in cart)
+    tracked = [v for v in needed if v in tenant.stock]
+    for v in tracked:
+        tenant.stock[v] -= needed[v]
+        if tenant.stock[v] == 0:
+            tenant.variety_keyboards.pop(tenant.variety_type[v], None)
+
+    if tracked:
+        save_stock(tenant)
+    return []
+
+
+def get_variety_keyboard(tenant, ctype):
+    markup = tenant.variety_keyboards.get(ctype)
+    if markup is None:
+        keyboard = [
+            [InlineKeyboardButton(f"{name} - ${price:.2f}", callback_data=f"var_{name}")]
+            for name, price in tenant.menu[ctype]["varieties"].items()
+            if in_stock(tenant, name)
+        ]
+        markup = tenant.variety_keyboards[ctype] = InlineKeyboardMarkup(keyboard)
+    return markup
+
+
+# ---------------------------
+# Prep-time model + pickup ETA
+# ---------------------------
+PREP_ALPHA = 0.2  # weight of the newest sample in each rolling average
+MAX_PREP_SAMPLE = 2 * 60 * 60  # ignore orders marked ready hours later (forgotten, not slow)
+# Ignore samples shorter than this fraction of the current estimate: admins often tap READY
+# for several finished orders in a row, and those later taps would record ~0s of work
+MIN_PREP_FRACTION = 0.25
+DEFAULT_PREP_SECONDS = {"Matcha": 180, "Coffee": 120, "Bakes": 30}
+
+
+def parse_item_varieties(items_text) -> list[str]:
+    """CSV 'Items' field -> variety names ('Iced Black (N/A) - Add-ons: None' -> 'Iced Black')."""
+    return [p.split(" (", 1)[0].strip() for p in (items_text or "").split(";") if p.strip()]
+
+
+def prep_estimate(tenant, variety) -> float:
+    est = tenant.prep_avg.get(variety)
+    if est is None:
+        est = DEFAULT_PREP_SECONDS.get(tenant.variety_type.get(variety), 120)
+    return est
+
+
+def order_estimate(tenant, varieties) -> float:
+    return sum(prep_estimate(tenant, v) for v in varieties)
+
+
+def record_prep_time(tenant, varieties, seconds):
+    """
+    Fold one completed order into the per-item rolling averages.
+    Multi-item orders are split between items in proportion to their current estimates.
+    """
+    if not varieties or seconds < 0 or seconds > MAX_PREP_SAMPLE:
+        return
+
+    estimates = [prep_estimate(tenant, v) for v in varieties]
+    predicted = sum(estimates)
+    if seconds < MIN_PREP_FRACTION * predicted:
+        return
+
+    for v, est in zip(varieties, estimates):
+        share = seconds * est / predicted if predicted > 0 else seconds / len(varieties)
+        old = tenant.prep_avg.get(v)
+        tenant.prep_avg[v] = share if old is None else old + PREP_ALPHA * (share - old)
+
+
+def work_started_at(tenant, ordered_at):
+    """Work on an order starts when it comes in or when the previous one was done, whichever is later."""
+    if tenant.last_ready_at and tenant.last_ready_at > ordered_at:
+        return tenant.last_ready_at
+    return ordered_at
+
+
+def record_ready(tenant, ordered_at, varieties, ready_at):
+    """Sample = time actually spent making the order, not time spent waiting in the queue."""
+    started_at = work_started_at(tenant, ordered_at)
+    record_prep_time(tenant, varieties, (ready_at - started_at).total_seconds())
+    if tenant.last_ready_at is None or ready_at > tenant.last_ready_at:
+        tenant.last_ready_at = ready_at
+
+
+def init_order_tracking(tenant, rows):
+    """Replay the CSV once at startup; after that everything is updated incrementally."""
+    tenant.prep_avg.clear()
+    tenant.pending_queue.clear()
+    tenant.last_ready_at = None
+
+    completed = []
+    for r in rows:
+        if not r:
+            continue
+        ordered_at = row_ordered_at(r)
+        varieties = parse_item_varieties(r[6] if len(r) > 6 else "")
+
+        if get_status(r) == "pending":
+            tenant.pending_queue[r[0]] = (ordered_at or datetime.now(), varieties)
+            continue
+
+        ready_at = row_ready_at(r)
+        if ordered_at and ready_at:
+            completed.append((ready_at, ordered_at, varieties))
+
+    # Replay in the order the kitchen finished them so last_ready_at is right for each sample
+    for ready_at, ordered_at, varieties in sorted(completed, key=lambda c: c[0]):
+        record_ready(tenant, ordered_at, varieties, ready_at)
+
+
+def track_new_order(tenant, order_id, ordered_at, varieties):
+    tenant.pending_queue[order_id] = (ordered_at, varieties)
+
+
+def track_order_ready(tenant, order_id, ready_at):
+    entry = tenant.pending_queue.pop(order_id, None)
+    if entry:
+        ordered_at, varieties = entry
+        record_ready(tenant, ordered_at, varieties, ready_at)
+
+
+def estimate_wait(tenant, order_id):
+    """
+    (queue position, seconds until ready) for a pending order, or None.
+    Assumes orders are made one at a time in the order they came in.
+    """
+    if order_id not in tenant.pending_queue:
+        return None
+
+    now = datetime.now()
+    wait = 0.0
+    for position, (oid, (ordered_at, varieties)) in enumerate(tenant.pending_queue.items(), 1):
+        est = order_estimate(tenant, varieties)
+        if position == 1:
+            # Head of the queue is already being made
+            est = max(0.0, est - (now - work_started_at(tenant, ordered_at)).total_seconds())
+        wait += est
+        if oid == order_id:
+            return position, wait
+
+
+def format_eta(seconds) -> str:
+    return f"~{max(1, math.ceil(seconds / 60))} min"
+
+
+# ---------------------------
+# Admin notifications (one background sender per tenant)
+# ---------------------------
+RUSH_WINDOW = 120  # seconds of order history used to detect a rush
+RUSH_THRESHOLD = 5  # this many orders within RUSH_WINDOW = rush
+DIGEST_SECONDS = 60  # during a rush, collect orders this long and send one digest
+TELEGRAM_MAX_TEXT = 4000  # a bit under Telegram's 4096 limit
+
+
+def parse_chat_ids(raw) -> list[int]:
+    ids = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            ids.append(int(part))
+        except ValueError:
+            logger.warning("Ignoring invalid admin chat id '%s'", part)
+    return ids
+
+
+def queue_admin_notification(tenant, bot, text):
+    """Never blocks: the background sender does the actual Telegram calls."""
+    if tenant.admin_chat_ids:
+        tenant.admin_queue.put_nowait((bot, text))
+
+
+def note_order_and_check_rush(tenant, now) -> bool:
+    recent = tenant.recent_orders
+    recent.append(now)
+    while recent and now - recent[0] > RUSH_WINDOW:
+        recent.popleft()
+    return len(recent) >= RUSH_THRESHOLD
+
+
+def chunk_messages(parts, header=""):
+    """Join parts into as few messages as possible, each under TELEGRAM_MAX_TEXT."""
+    chunks = []
+    current = header
+    for part in parts:
+        if current and len(current) + len(part) + 2 > TELEGRAM_MAX_TEXT:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def send_to_admins(tenant, bot, text):
+    for chat_id in tenant.admin_chat_ids:
+        try:
+            await bot.send_message(chat_id=chat_id, text=text)
+        except Exception as e:
+            logger.warning("[%s] Admin notification to %s failed: %s", tenant.name, chat_id, e)
+
+
+async def flush_digest(tenant, bot, batch):
+    header = f"🔥 Rush digest: {len(batch)} new order(s) in the last {DIGEST_SECONDS}s"
+    for chunk in chunk_messages(batch, header):
+        await send_to_admins(tenant, bot, chunk)
+
+
+async def admin_notifier(tenant):
+    """
+    Send each order on its own, or one digest per DIGEST_SECONDS during a rush.
+    Each tenant runs its own sender, so slow sends for one stall never hold up another's alerts.
+    A None on the queue (see stop_admin_notifiers) flushes any open digest and exits.
+    """
+    queue = tenant.admin_queue
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+
+        bot, text = item
+        if not note_order_and_check_rush(tenant, time.monotonic()):
+            await send_to_admins(tenant, bot, text)
+            continue
+
+        batch = [text]
+        stopping = False
+        deadline = time.monotonic() + DIGEST_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                item = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stopping = True
+                break
+            note_order_and_check_rush(tenant, time.monotonic())
+            batch.append(item[1])
+
+        await flush_digest(tenant, bot, batch)
+        if stopping:
+            return
+
+
+async def stop_admin_notifiers(notifiers):
+    """Let each sender finish everything queued before it (FIFO), then wait for all of them."""
+    for tenant in notifiers:
+        tenant.admin_queue.put_nowait(None)
+    results = await asyncio.gather(*notifiers.values(), return_exceptions=True)
+    for tenant, result in zip(notifiers, results):
+        if isinstance(result, Exception):
+            logger.error("[%s] Admin notifier failed: %s", tenant.name, result)
+
+
+def format_admin_order(order_id, customer_name, customer_username, cart) -> str:
+    total = sum(float(item["price"]) for item in cart)
+    lines = [
+        f"🆕 New order #{order_id}",
+        f"👤 {customer_name} " + (f"@{customer_username}" if customer_username != "N/A" else ""),
+        f"💰 ${total:.2f}",
+    ]
+    for item in cart:
+        addons = ", ".join(item.get("addons", [])) or "None"
+        lines.append(f"   • {item['variety']} - Add-ons: {addons}")
+    return "\n".join(lines)
+
+
+# ---------------------------
+# Payment proofs (stored by file_id, downloaded in the background)
+# ---------------------------
+def proof_path(tenant, unique_id) -> Path:
+    # file_unique_id is the same for the same image, so each screenshot is stored once
+    return tenant.proofs_dir / f"{unique_id}.jpg"
+
+
+PROOF_RETRY_SECONDS = 300  # how often failed proof downloads are retried
+PROOF_MAX_ATTEMPTS = 5  # then give up until the next restart (/proof still works by file_id)
+PROOF_DOWNLOAD_LIMIT = 3  # concurrent downloads across all tenants (they share one connection pool)
+
+_proof_download_slots = asyncio.Semaphore(PROOF_DOWNLOAD_LIMIT)
+
+
+def schedule_proof_download(application, tenant, file_id, unique_id):
+    """Fire-and-forget: the customer's confirmation never waits on this."""
+    if proof_path(tenant, unique_id).exists():
+        tenant.missing_proofs.pop(unique_id, None)
+        return
+    if unique_id in tenant.proof_downloads:
+        return
+    tenant.proof_downloads.add(unique_id)
+    application.create_task(download_proof(application.bot, tenant, file_id, unique_id))
+
+
+async def download_proof(bot, tenant, file_id, unique_id):
+    path = proof_path(tenant, unique_id)
+    tmp = path.with_suffix(".part")
+    try:
+        # A backlog of proofs must not crowd customer-facing calls out of the shared pool
+        async with _proof_download_slots:
+            tenant.proofs_dir.mkdir(parents=True, exist_ok=True)
+            tg_file = await bot.get_file(file_id)
+            await tg_file.download_to_drive(tmp)
+        tmp.replace(path)
+        tenant.missing_proofs.pop(unique_id, None)
+    except Exception as e:
+        tmp.unlink(missing_ok=True)
+        _, attempts = tenant.missing_proofs.get(unique_id, (file_id, 0))
+        attempts += 1
+        if attempts >= PROOF_MAX_ATTEMPTS:
+            tenant.missing_proofs.pop(unique_id, None)
+            logger.error("[%s] Giving up on payment proof %s: %s", tenant.name, unique_id, e)
+        else:
+            # retry_missing_proofs picks it up again later
+            tenant.missing_proofs[unique_id] = (file_id, attempts)
+            logger.warning("[%s] Could not download payment proof %s: %s", tenant.name, unique_id, e)
+    finally:
+        tenant.proof_downloads.discard(unique_id)
+
+
+def find_missing_proofs(tenant, rows):
+    """Startup pass: screenshots recorded in the CSV that have no local copy yet."""
+    for r in rows:
+        file_id = r[10] if len(r) > 10 else ""
+        unique_id = r[11] if len(r) > 11 else ""
+        if file_id and unique_id and not proof_path(tenant, unique_id).exists():
+            tenant.missing_proofs[unique_id] = (file_id, 0)
+
+
+async def retry_missing_proofs(apps):
+    """Background job: (re)try every missing proof now, then every PROOF_RETRY_SECONDS."""
+    while True:
+        for app in apps:
+            tenant = app.bot_data["tenant"]
+            for unique_id, (file_id, _) in list(tenant.missing_proofs.items()):
+                schedule_proof_download(app, tenant, file_id, unique_id)
+        await asyncio.sleep(PROOF_RETRY_SECONDS)
+
+
+def type_keyboard(tenant):
+    return InlineKeyboardMarkup(
+        [[InlineKeyboardButton(t, callback_data=f"type_{t}")] for t in tenant.menu.keys()]
+    )
+
+
 # ---------------------------
 # User Flow
 # ---------------------------
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    tenant = get_tenant(context)
     context.user_data.clear()
     context.user_data["cart"] = []
 
-    welcome_text = (
-        "☕ *Welcome to Kristy Krib's Home Cafe!*\n\n"
-        "📋 *Our Menu:*\n\n"
-        "*Matcha Drinks:*\n"
-        "• Iced Matcha - $7.00\n"
-        "• Strawberry Matcha - $8.00\n"
-        "*Coffee:*\n"
-        "• Iced Black - $4.50\n"
-        "• Ice White - $5.50\n"
-        "*Fresh Bakes:*\n"
-        "• Banana Bread - $4.00\n"
-        "• Earl Grey Madeleines - $5.00\n"
-        "• Matcha Madeleines - $6.00\n\n"
-        "🥛 *Add-ons:*\n"
-        "• Oat Milk (+$1.00)\n"
-        "• Add Espresso Shot (+$1.00)\n\n"
-        "Let's start your order! 👇"
-    )
-
-    keyboard = [[InlineKeyboardButton(t, callback_data=f"type_{t}")] for t in MENU.keys()]
-
     await update.message.reply_text(
-        welcome_text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode="Markdown"
+        tenant.welcome_text, reply_markup=type_keyboard(tenant), parse_mode="Markdown"
     )
     return COFFEE_TYPE
 
@@ -215,18 +885,25 @@ async def coffee_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await safe_answer(query)
 
+    # Excess taps were already acknowledged above; do no further work
+    if not allow_tap(query, "coffee"):
+        return COFFEE_TYPE
+
+    tenant = get_tenant(context)
     ctype = query.data.replace("type_", "", 1)
     context.user_data["current"] = {"type": ctype, "addons": [], "temp": "N/A"}
 
-    varieties = MENU[ctype]["varieties"]
-    keyboard = [
-        [InlineKeyboardButton(f"{name} - ${price:.2f}", callback_data=f"var_{name}")]
-        for name, price in varieties.items()
-    ]
+    markup = get_variety_keyboard(tenant, ctype)
+    if not markup.inline_keyboard:
+        await query.edit_message_text(
+            f"Sorry, all {ctype} items are sold out 😢\n\nPlease pick another category:",
+            reply_markup=type_keyboard(tenant),
+        )
+        return COFFEE_TYPE
 
     await query.edit_message_text(
         f"You selected: {ctype}\n\nChoose your item:",
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=markup,
     )
     return VARIETY
 
@@ -236,16 +913,26 @@ async def variety_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     await safe_answer(query)
 
 
+    tenant = get_tenant(context)
     variety = query.data.replace("var_", "", 1)
     curr = context.user_data["current"]
-    curr["variety"] = variety
-
     ctype = curr["type"]
-    base_price = MENU[ctype]["varieties"][variety]
+
+    # Keyboard may be stale: re-check against what's already in the cart
+    in_cart = sum(1 for item in context.user_data["cart"] if item["variety"] == variety)
+    if not in_stock(tenant, variety, in_cart + 1):
+        await query.edit_message_text(
+            f"Sorry, {variety} just sold out 😢\n\nChoose another item:",
+            reply_markup=type_keyboard(tenant),
+        )
+        return COFFEE_TYPE
+
+    curr["variety"] = variety
+    base_price = tenant.menu[ctype]["varieties"][variety]
     curr["base_price"] = float(base_price)
 
     # If Bakes: skip addons
-    if ctype == "Bakes":
+    if not category_has_addons(tenant.menu, ctype):
         curr["temp"] = "N/A"
         curr["price"] = float(base_price)
         context.user_data["cart"].append(curr.copy())
@@ -266,7 +953,7 @@ async def variety_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
     # Drinks: show addons
     keyboard = []
-    for addon, price in ADDONS_MENU.items():
+    for addon, price in tenant.addons_menu.items():
         price_text = f" (+${price:.2f})" if price > 0 else ""
         keyboard.append([InlineKeyboardButton(f"{addon}{price_text}", callback_data=f"addon_{addon}")])
 
@@ -284,14 +971,17 @@ async def addon_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await safe_answer(query)
 
+    if not allow_tap(query, "addon"):
+        return ADDONS
 
+    tenant = get_tenant(context)
     curr = context.user_data["current"]
     data = query.data or ""
 
     # Done selecting add-ons
     if data == "addon_done":
         base_price = float(curr.get("base_price", 0.0))
-        addon_price = calc_addon_price(curr.get("addons", []))
+        addon_price = calc_addon_price(tenant, curr.get("addons", []))
         curr["addon_price"] = addon_price
         curr["price"] = base_price + addon_price
 
@@ -322,12 +1012,12 @@ async def addon_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     # LIVE subtotal display
     base_price = float(curr.get("base_price", 0.0))
-    addon_price = calc_addon_price(curr.get("addons", []))
+    addon_price = calc_addon_price(tenant, curr.get("addons", []))
     item_total = base_price + addon_price
     addons_text = ", ".join(curr["addons"]) if curr["addons"] else "None"
 
     keyboard = []
-    for name, price in ADDONS_MENU.items():
+    for name, price in tenant.addons_menu.items():
         price_text = f" (+${price:.2f})" if price > 0 else ""
         keyboard.append([InlineKeyboardButton(f"{name}{price_text}", callback_data=f"addon_{name}")])
     keyboard.append([InlineKeyboardButton("✅ Done with add-ons", callback_data="addon_done")])
@@ -347,13 +1037,22 @@ async def review_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     query = update.callback_query
     await safe_answer(query)
 
+    tenant = get_tenant(context)
 
     if query.data == "add_more":
-        keyboard = [[InlineKeyboardButton(t, callback_data=f"type_{t}")] for t in MENU.keys()]
-        await query.edit_message_text("Select your coffee type:", reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text("Select your coffee type:", reply_markup=type_keyboard(tenant))
         return COFFEE_TYPE
 
     # checkout
+    sold_out = stock_shortfall(tenant, context.user_data["cart"])
+    if sold_out:
+        await query.edit_message_text(
+            f"Sorry, these items sold out: {', '.join(sold_out)} 😢\n\n"
+            "Type /start to place a new order."
+        )
+        context.user_data.clear()
+        return ConversationHandler.END
+
     username = query.from_user.username or query.from_user.first_name or "Customer"
     order_number = random.randint(100, 999)
     order_id = f"{username}_{order_number}"
@@ -370,8 +1069,8 @@ async def review_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         "QR code will be sent in next message..."
     )
 
-    if PAYNOW_QR.exists():
-        with PAYNOW_QR.open("rb") as photo:
+    if tenant.paynow_qr.exists():
+        with tenant.paynow_qr.open("rb") as photo:
             await context.bot.send_photo(
                 chat_id=query.message.chat_id,
                 photo=photo,
@@ -382,7 +1081,7 @@ async def review_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
             chat_id=query.message.chat_id,
             text=(
                 "⚠️ QR code image not found.\n"
-                f"Expected: {PAYNOW_QR}\n\n"
+                f"Expected: {tenant.paynow_qr}\n\n"
                 f"Amount to pay: ${total:.2f}"
             ),
         )
@@ -398,17 +1097,63 @@ async def payment_done(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         await update.message.reply_text("Please send a payment screenshot or type 'PAID' to confirm.")
         return PAYMENT
 
+    tenant = get_tenant(context)
     order_id = context.user_data.get("order_id", "N/A")
     customer_name = update.effective_user.first_name or "Customer"
     customer_username = update.effective_user.username or "N/A"
     customer_id = update.effective_user.id
 
-    save_order_to_file(order_id, customer_name, customer_username, customer_id, context.user_data["cart"])
+    proof = None
+    if has_photo:
+        largest = update.message.photo[-1]  # Telegram sends sizes smallest -> largest
+        proof = (largest.file_id, largest.file_unique_id)
+        # Refund orders below need their screenshot just as much as normal ones
+        schedule_proof_download(context.application, tenant, *proof)
+
+    sold_out = take_stock(tenant, context.user_data["cart"])
+    if sold_out:
+        # Customer has already paid: keep the order on file as owed a refund and tell the admins
+        save_order_to_file(
+            tenant, order_id, customer_name, customer_username, customer_id, context.user_data["cart"], proof,
+            status="refund",
+        )
+        queue_admin_notification(
+            tenant,
+            context.bot,
+            f"💸 REFUND NEEDED - sold out: {', '.join(sold_out)}\n"
+            + format_admin_order(order_id, customer_name, customer_username, context.user_data["cart"]),
+        )
+
+        await update.message.reply_text(
+            f"😢 Sorry, these items sold out before your payment came in: {', '.join(sold_out)}\n\n"
+            f"Order #{order_id} could not be prepared. Your payment is recorded and "
+            f"we've been notified to refund you.\n\n"
+            f"Type /start to place a new order."
+        )
+        context.user_data.clear()
+        return ConversationHandler.END
+
+    save_order_to_file(
+        tenant, order_id, customer_name, customer_username, customer_id, context.user_data["cart"], proof
+    )
+    queue_admin_notification(
+        tenant,
+        context.bot,
+        format_admin_order(order_id, customer_name, customer_username, context.user_data["cart"]),
+    )
+
+    eta_text = ""
+    queued = estimate_wait(tenant, order_id)
+    if queued:
+        position, wait = queued
+        eta_text = f"Queue position: {position}\nEstimated ready in {format_eta(wait)}.\n"
 
     await update.message.reply_text(
         f"✅ Payment received!\n\n"
         f"Order ID: #{order_id}\n"
-        f"Your order is being prepared.\n\n"
+        f"Your order is being prepared.\n"
+        f"{eta_text}\n"
+        f"Check progress anytime with /status {order_id}\n\n"
         f"Thank you for ordering from Home Cafe! ☕\n\n"
         f"Type /start to place a new order."
     )
@@ -426,9 +1171,9 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 # ---------------------------
 # Save order
 # ---------------------------
-def save_order_to_file(order_id, customer_name, customer_username, customer_id, cart):
-    ORDERS_DIR.mkdir(parents=True, exist_ok=True)
-
+def save_order_to_file(
+    tenant, order_id, customer_name, customer_username, customer_id, cart, proof=None, status="pending"
+):
     total = sum(float(item["price"]) for item in cart)
     items_text = "; ".join(
         [
@@ -437,38 +1182,35 @@ def save_order_to_file(order_id, customer_name, customer_username, customer_id,
         ]
     )
 
-    is_new_file = not ORDERS_CSV.exists() or ORDERS_CSV.stat().st_size == 0
-
-    from datetime import datetime
     now = datetime.now()
 
-    with ORDERS_CSV.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if is_new_file:
-            writer.writerow(
-                ["Order ID", "Date", "Time", "Customer Name", "Username", "User ID", "Items", "Total", "Status"]
-            )
+    submit_io(
+        append_order_row,
+        tenant,
+        [
+            order_id,
+            now.strftime("%Y-%m-%d"),
+            now.strftime("%H:%M:%S"),
+            customer_name,
+            f"@{customer_username}" if customer_username != "N/A" else "N/A",
+            str(customer_id),
+            items_text,
+            f"${total:.2f}",
+            status,
+            "",
+            *(proof or ("", "")),
+        ],
+    )
 
-        writer.writerow(
-            [
-                order_id,
-                now.strftime("%Y-%m-%d"),
-                now.strftime("%H:%M:%S"),
-                customer_name,
-                f"@{customer_username}" if customer_username != "N/A" else "N/A",
-                str(customer_id),
-                items_text,
-                f"${total:.2f}",
-                "pending",
-            ]
-        )
+    if status == "pending":
+        track_new_order(tenant, order_id, now, [item["variety"] for item in cart])
 
 
 # ---------------------------
 # Admin commands: orders/today/pending
 # ---------------------------
 async def view_orders(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    header, rows = load_orders_rows()
+    header, rows = await run_io(load_orders_rows, get_tenant(context))
     if not rows:
         await update.message.reply_text("No orders yet!")
         return
@@ -482,7 +1224,7 @@ async def view_orders(update: Update, context: ContextTypes.DEFAULT_TYPE):
         customer = r[3] if len(r) > 3 else "Customer"
         total = r[7] if len(r) > 7 else ""
         status = get_status(r)
-        status_emoji = "✅" if status == "ready" else "⏳"
+        status_emoji = "✅" if status == "ready" else "💸" if status == "refund" else "⏳"
         msg += f"{status_emoji} *{order_id}* - {date} {time}\n"
         msg += f"Customer: {customer}\n"
         msg += f"Total: {total}\n\n"
@@ -493,7 +1235,7 @@ async def view_orders(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def today_orders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     from datetime import datetime
 
-    header, rows = load_orders_rows()
+    header, rows = await run_io(load_orders_rows, get_tenant(context))
     if not rows:
         await update.message.reply_text("No orders yet!")
         return
@@ -507,7 +1249,7 @@ async def today_orders(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     total_sales = 0.0
     for r in today_rows:
-        if len(r) > 7 and r[7].startswith("$"):
+        if len(r) > 7 and r[7].startswith("$") and get_status(r) != "refund":
             try:
                 total_sales += float(r[7].replace("$", ""))
             except ValueError:
@@ -523,13 +1265,13 @@ async def today_orders(update: Update, context: ContextTypes.DEFAULT_TYPE):
         customer = r[3] if len(r) > 3 else "Customer"
         total = r[7] if len(r) > 7 else ""
         status = get_status(r)
-        status_emoji = "✅" if status == "ready" else "⏳"
+        status_emoji = "✅" if status == "ready" else "💸" if status == "refund" else "⏳"
         msg += f"{status_emoji} {oid} - {customer} - {total}\n"
 
     await update.message.reply_text(msg, parse_mode="Markdown")
 
 async def view_pending(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    header, rows = load_orders_rows()
+    header, rows = await run_io(load_orders_rows, get_tenant(context))
     if not rows:
         await update.message.reply_text("No orders yet!")
         return
@@ -546,42 +1288,38 @@ async def pending_buttons_callback(update: Update, context: ContextTypes.DEFAULT
     query = update.callback_query
     await safe_answer(query)
 
+    tenant = get_tenant(context)
     data = query.data or ""
 
-    # Refresh
+    # Refresh (full CSV reload) - skip if one is already running or user is spamming
     if data == "pending:refresh":
-        header, rows = load_orders_rows()
-        text, markup = build_pending_message(rows)
+        if tenant.refresh_in_flight or not allow_tap(query, "refresh"):
+            return
 
-        if markup:
-            await query.edit_message_text(text, parse_mode="Markdown", reply_markup=markup)
-        else:
-            await query.edit_message_text(text, parse_mode="Markdown")
+        tenant.refresh_in_flight = True
+        try:
+            header, rows = await run_io(load_orders_rows, tenant)
+            text, markup = build_pending_message(rows)
+
+            if markup:
+                await query.edit_message_text(text, parse_mode="Markdown", reply_markup=markup)
+            else:
+                await query.edit_message_text(text, parse_mode="Markdown")
+        finally:
+            tenant.refresh_in_flight = False
         return
 
     # Mark ready
     if data.startswith("ready:"):
         order_id = data.split("ready:", 1)[1]
 
-        header, rows = load_orders_rows()
-        if not rows:
-            await query.edit_message_text("No orders found!")
-            return
-
-        found_index = None
-        for i, r in enumerate(rows):
-            if len(r) > 0 and r[0] == order_id and get_status(r) == "pending":
-                found_index = i
-                break
-
-        if found_index is None:
+        marked = await run_io(mark_ready_in_csv, tenant, order_id)
+        if marked is None:
             await query.answer("Order not found or already ready.", show_alert=True)
             return
 
-        row = rows[found_index]
-        set_status(row, "ready")
-        rows[found_index] = row
-        save_orders_rows(header, rows)
+        row, ready_at, rows = marked
+        track_order_ready(tenant, order_id, ready_at)
 
         # Notify customer
         customer_name = row[3] if len(row) > 3 else "Customer"
@@ -601,8 +1339,7 @@ async def pending_buttons_callback(update: Update, context: ContextTypes.DEFAULT
             except Exception as e:
                 notify_error = str(e)
 
-        # Refresh list (WITH DETAILS)
-        header, rows = load_orders_rows()
+        # Refresh list (WITH DETAILS) - rows already reflect the change
         text, markup = build_pending_message(rows)
 
         confirm = f"✅ Marked `{md_escape(order_id)}` as READY.\n"
@@ -679,27 +1416,16 @@ async def mark_ready(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Please specify order ID.\nUsage: /ready ORD12345")
         return
 
+    tenant = get_tenant(context)
     order_id = context.args[0]
-    header, rows = load_orders_rows()
-
-    if not rows:
-        await update.message.reply_text("No orders found!")
-        return
-
-    found = None
-    for i, r in enumerate(rows):
-        if r and r[0] == order_id and get_status(r) == "pending":
-            found = i
-            break
 
-    if found is None:
+    marked = await run_io(mark_ready_in_csv, tenant, order_id)
+    if marked is None:
         await update.message.reply_text(f"❌ Order {order_id} not found or already marked as ready.")
         return
 
-    row = rows[found]
-    set_status(row, "ready")
-    rows[found] = row
-    save_orders_rows(header, rows)
+    row, ready_at, rows = marked
+    track_order_ready(tenant, order_id, ready_at)
 
     customer_chat_id = row[5] if len(row) > 5 else None
     customer_name = row[3] if len(row) > 3 else "Customer"
@@ -719,6 +1445,140 @@ async def mark_ready(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"✅ Order {order_id} marked as ready!\n⚠️ Could not notify customer: {e}")
 
 
+async def order_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/status ORDER_ID"""
+    if not context.args:
+        await update.message.reply_text("Please specify order ID.\nUsage: /status ORDER_ID")
+        return
+
+    order_id = context.args[0].lstrip("#")
+    queued = estimate_wait(get_tenant(context), order_id)
+    if not queued:
+        await update.message.reply_text(
+            f"Order #{order_id} isn't in the queue. It may already be ready, or the ID is wrong."
+        )
+        return
+
+    position, wait = queued
+    await update.message.reply_text(
+        f"⏳ Order #{order_id}\n"
+        f"Queue position: {position}\n"
+        f"Estimated ready in {format_eta(wait)}."
+    )
+
+
+async def view_proof(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/proof ORDER_ID - re-send the payment screenshot by file_id (no re-upload)"""
+    tenant = get_tenant(context)
+    if not is_admin(update, tenant):
+        # Screenshots show customers' names and bank details
+        await update.message.reply_text("⛔ Admins only.")
+        return
+
+    if not context.args:
+        await update.message.reply_text("Please specify order ID.\nUsage: /proof ORDER_ID")
+        return
+
+    order_id = context.args[0].lstrip("#")
+    header, rows = await run_io(load_orders_rows, tenant)
+
+    found = None
+    for r in reversed(rows):
+        if r and r[0] == order_id:
+            found = r
+            break
+
+    if found is None:
+        await update.message.reply_text(f"❌ Order {order_id} not found.")
+        return
+
+    file_id = found[10] if len(found) > 10 else ""
+    unique_id = found[11] if len(found) > 11 else ""
+    if not file_id:
+        # Either the customer typed PAID or the order predates proof tracking
+        await update.message.reply_text(f"No payment proof was recorded for order {order_id}.")
+        return
+
+    caption = f"🧾 Payment proof for #{order_id}"
+    try:
+        await update.message.reply_photo(photo=file_id, caption=caption)
+    except BadRequest as e:
+        # Fall back to our downloaded copy if Telegram no longer accepts the file_id
+        path = proof_path(tenant, unique_id) if unique_id else None
+        if not (path and path.exists()):
+            await update.message.reply_text(f"⚠️ Could not send proof for {order_id}: {e}")
+            return
+        with path.open("rb") as photo:
+            await update.message.reply_photo(photo=photo, caption=caption)
+
+
+# ---------------------------
+# Admin commands: stock/setstock/restock
+# ---------------------------
+def parse_stock_args(tenant, args):
+    """'/setstock Banana Bread 10' -> ("Banana Bread", 10). None if invalid."""
+    if len(args) < 2:
+        return None
+    try:
+        qty = int(args[-1])
+    except ValueError:
+        return None
+
+    name = " ".join(args[:-1]).strip().lower()
+    for variety in tenant.variety_type:
+        if variety.lower() == name:
+            return variety, qty
+    return None
+
+
+async def view_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    tenant = get_tenant(context)
+    msg = "📦 *Stock:*\n\n"
+    for variety in tenant.variety_type:
+        left = tenant.stock.get(variety)
+        if left is None:
+            msg += f"• {md_escape(variety)}: not tracked\n"
+        else:
+            emoji = "❌" if left == 0 else "✅"
+            msg += f"{emoji} {md_escape(variety)}: {left}\n"
+
+    await update.message.reply_text(msg, parse_mode="Markdown")
+
+
+async def set_stock_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/setstock ITEM QTY"""
+    tenant = get_tenant(context)
+    if not is_admin(update, tenant):
+        await update.message.reply_text("⛔ Admins only.")
+        return
+
+    parsed = parse_stock_args(tenant, context.args)
+    if not parsed:
+        await update.message.reply_text("Usage: /setstock Banana Bread 10")
+        return
+
+    variety, qty = parsed
+    set_stock(tenant, variety, qty)
+    await update.message.reply_text(f"✅ {variety} stock set to {tenant.stock[variety]}.")
+
+
+async def restock_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/restock ITEM QTY (adds to current stock)"""
+    tenant = get_tenant(context)
+    if not is_admin(update, tenant):
+        await update.message.reply_text("⛔ Admins only.")
+        return
+
+    parsed = parse_stock_args(tenant, context.args)
+    if not parsed:
+        await update.message.reply_text("Usage: /restock Banana Bread 5")
+        return
+
+    variety, qty = parsed
+    set_stock(tenant, variety, tenant.stock.get(variety, 0) + qty)
+    await update.message.reply_text(f"✅ {variety} restocked, now {tenant.stock[variety]}.")
+
+
 # ---------------------------
 # Error handler (shows why it "won't start")
 # ---------------------------
@@ -729,25 +1589,82 @@ async def on_error(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
 # ---------------------------
 # Main
 # ---------------------------
-def main() -> None:
-    # Load dotenv reliably from script folder
-    load_dotenv(BASE_DIR / ".env")
-    BOT_TOKEN = os.getenv("BOT_TOKEN", "").strip()
+SHARED_POOL_SIZE = 256  # HTTP connections shared by every tenant's bot (PTB's own default)
 
-    print("ptb script path:", BASE_DIR)
-    print("orders csv path:", ORDERS_CSV)
 
-    if not BOT_TOKEN:
-        print("❌ Error: BOT_TOKEN not found in .env next to this .py file")
-        print(f"Expected .env at: {BASE_DIR / '.env'}")
-        return
+class SharedHTTPXRequest(HTTPXRequest):
+    """
+    One connection pool for every tenant's bot. Bot.shutdown() would close it for all
+    of them, so that is a no-op here; run_tenants calls close() once at the very end.
+    """
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await super().shutdown()
+
+
+def load_tenants() -> list[Tenant]:
+    """
+    tenants.json next to this file, e.g.
+      [{"name": "popup", "token_env": "POPUP_BOT_TOKEN", "orders_dir": "orders/popup",
+        "paynow_qr": "assets/popup_qr.jpg", "admin_chat_ids": [123], "menu": {...}, "addons": {...}}]
+    orders_dir defaults to orders/<name>. Without tenants.json, a single tenant is built
+    from BOT_TOKEN / ADMIN_CHAT_IDS in .env. Raises ValueError on duplicate names or stores.
+    """
+    if not TENANTS_JSON.exists():
+        token = os.getenv("BOT_TOKEN", "").strip()
+        if not token:
+            return []
+        return [Tenant("default", token, admin_chat_ids=parse_chat_ids(os.getenv("ADMIN_CHAT_IDS", "")))]
+
+    with TENANTS_JSON.open("r", encoding="utf-8") as f:
+        configs = json.load(f)
+
+    tenants = []
+    seen_names, seen_dirs = set(), set()
+    for cfg in configs:
+        name = cfg["name"]
+        orders_dir = (resolve_path(cfg.get("orders_dir")) or ORDERS_DIR / name).resolve()
+        if name in seen_names:
+            raise ValueError(f"duplicate tenant name '{name}' in {TENANTS_JSON}")
+        if orders_dir in seen_dirs:
+            raise ValueError(f"tenant '{name}' shares orders_dir {orders_dir} with another tenant")
+        seen_names.add(name)
+        seen_dirs.add(orders_dir)
+
+        token = (cfg.get("token") or os.getenv(cfg.get("token_env", ""), "")).strip()
+        if not token:
+            print(f"❌ Skipping tenant '{name}': no token (set 'token' or 'token_env')")
+            continue
+
+        tenants.append(
+            Tenant(
+                name,
+                token,
+                menu=cfg.get("menu"),
+                addons_menu=cfg.get("addons"),
+                orders_dir=orders_dir,
+                paynow_qr=resolve_path(cfg.get("paynow_qr")),
+                admin_chat_ids=cfg.get("admin_chat_ids"),
+                title=cfg.get("title"),
+            )
+        )
+    return tenants
 
-    app = Application.builder().token(BOT_TOKEN).build()
+
+def build_application(tenant: Tenant, request: HTTPXRequest) -> Application:
+    app = Application.builder().token(tenant.token).request(request).build()
+    app.bot_data["tenant"] = tenant
     app.add_error_handler(on_error)
 
     # 1) Admin button callbacks FIRST (group 0)
     app.add_handler(CallbackQueryHandler(pending_buttons_callback, pattern=r"^ready:"), group=0)
-    app.add_handler(CallbackQueryHandler(pending_buttons_callback, pattern=r"^pending:refresh$"), group=0)
+    # block=False: refreshes run as tasks, so refresh_in_flight can drop taps while one is running
+    app.add_handler(
+        CallbackQueryHandler(pending_buttons_callback, pattern=r"^pending:refresh$", block=False), group=0
+    )
 
     # 2) Ordering flow SECOND (group 1)
     conv_handler = ConversationHandler(
@@ -769,9 +1686,123 @@ def main() -> None:
     app.add_handler(CommandHandler("today", today_orders))
     app.add_handler(CommandHandler("pending", view_pending))
     app.add_handler(CommandHandler("ready", mark_ready))
+    app.add_handler(CommandHandler("status", order_status))
+    app.add_handler(CommandHandler("proof", view_proof))
+    app.add_handler(CommandHandler("stock", view_stock))
+    app.add_handler(CommandHandler("setstock", set_stock_cmd))
+    app.add_handler(CommandHandler("restock", restock_cmd))
+    return app
+
+
+async def start_application(app: Application) -> bool:
+    """Start one tenant's bot. A bad token etc. only takes out that tenant."""
+    tenant = app.bot_data["tenant"]
+    try:
+        await app.initialize()
+        await app.start()
+        await app.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+        return True
+    except Exception:
+        logger.exception("[%s] Could not start bot; skipping this tenant", tenant.name)
+
+    # Undo whatever part of the startup succeeded
+    try:
+        if app.updater.running:
+            await app.updater.stop()
+        if app.running:
+            await app.stop()
+        await app.shutdown()
+    except Exception:
+        logger.exception("[%s] Error while cleaning up failed start", tenant.name)
+    return False
+
+
+async def run_tenants(tenants: list[Tenant]) -> None:
+    """Poll every tenant's bot on this one event loop until Ctrl+C / SIGTERM."""
+    # One connection pool for all API calls; getUpdates keeps its own per-bot request
+    request = SharedHTTPXRequest(connection_pool_size=SHARED_POOL_SIZE)
+    apps = [build_application(t, request) for t in tenants]
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C cancels run_tenants instead
+
+    notifiers = {t: asyncio.create_task(admin_notifier(t)) for t in tenants}
+    writer = asyncio.create_task(file_writer())
+    proof_retry = None
+    started = []
+    try:
+        for app in apps:
+            if await start_application(app):
+                started.append(app)
 
-    print("🤖 Bot is running... Press Ctrl+C to stop.")
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+        if not started:
+            print("❌ Error: no bot could be started")
+            return
+
+        print(f"🤖 {len(started)} bot(s) running... Press Ctrl+C to stop.")
+        proof_retry = asyncio.create_task(retry_missing_proofs(started))
+        await stop.wait()
+    finally:
+        try:
+            if proof_retry:
+                proof_retry.cancel()
+
+            # Stop taking updates everywhere first, then let each app drain its queued
+            # updates and create_task work (proof downloads) while the pool is still open
+            for app in started:
+                if app.updater.running:
+                    await app.updater.stop()
+            for app in started:
+                if app.running:
+                    await app.stop()
+        finally:
+            # Queued file writes are orders and stock counts: drain them no matter what
+            # failed above, and before anything else that might fail
+            try:
+                await stop_file_writer(writer)
+            finally:
+                try:
+                    # Admin alerts queued while the apps were draining still go out
+                    await stop_admin_notifiers(notifiers)
+                finally:
+                    for app in started:
+                        await app.shutdown()
+                    await request.close()
+
+
+def main() -> None:
+    # Load dotenv reliably from script folder
+    load_dotenv(BASE_DIR / ".env")
+
+    print("ptb script path:", BASE_DIR)
+
+    try:
+        tenants = load_tenants()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    if not tenants:
+        print("❌ Error: BOT_TOKEN not found in .env next to this .py file")
+        print(f"Expected .env at: {BASE_DIR / '.env'} (or tenants at {TENANTS_JSON})")
+        return
+
+    for tenant in tenants:
+        print(f"[{tenant.name}] orders csv path:", tenant.orders_csv)
+        load_stock(tenant)
+        header, rows = load_orders_rows(tenant)
+        init_order_tracking(tenant, rows)
+        find_missing_proofs(tenant, rows)
+
+    try:
+        asyncio.run(run_tenants(tenants))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":